@@ -1,12 +1,99 @@
-from sqlalchemy import create_engine
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event, select, update, delete, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+load_dotenv()
+
+# SQLite by default; set DATABASE_URL to use PostgreSQL in production
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+is_sqlite = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
+if is_sqlite:
+    engine_options = {"connect_args": {"check_same_thread": False}}
+else:
+    # Server databases: keep warm connections for concurrent requests and
+    # detect ones dropped by the server before handing them out
+    engine_options = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    # Bulk inserts (seed, /api/borrowers/bulk) are sent as multi-row INSERTs of this many rows
+    insertmanyvalues_page_size=1000,
+    **engine_options
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+if is_sqlite:
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while a write is in progress, and NORMAL sync
+        # is safe in WAL mode while avoiding an fsync on every commit
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+# Objects keep their loaded values after commit, so handlers can return them
+# without a refresh SELECT (primary keys are already set by the flush)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
+
+def dialect_insert(table):
+    """Returns an INSERT for the engine's dialect, supporting on_conflict_do_nothing()."""
+    if engine.dialect.name == "postgresql":
+        return postgresql_insert(table)
+    return sqlite_insert(table)
+
+def merge_duplicate_regions(connection):
+    """Points borrowers at the lowest region_id of each duplicated region_name and deletes the other rows."""
+    region = Base.metadata.tables["Region"]
+    borrowers = Base.metadata.tables["Borrowers"]
+    duplicates = connection.execute(
+        select(region.c.region_name, func.min(region.c.region_id))
+        .group_by(region.c.region_name)
+        .having(func.count() > 1)
+    ).all()
+    for region_name, keep_id in duplicates:
+        merged = (region.c.region_name == region_name) & (region.c.region_id != keep_id)
+        connection.execute(
+            update(borrowers)
+            .where(borrowers.c.region_id.in_(select(region.c.region_id).where(merged)))
+            .values(region_id=keep_id)
+        )
+        connection.execute(delete(region).where(merged))
+    if duplicates:
+        print(f"Merged duplicate rows for {len(duplicates)} region name(s)")
+
+def create_tables():
+    """Creates missing tables, plus indexes added to models after a table was created."""
+    Base.metadata.create_all(bind=engine)
+    # Databases created before region_name was unique may hold duplicate names,
+    # which would block its unique index (and with it ON CONFLICT region inserts)
+    with engine.begin() as connection:
+        merge_duplicate_regions(connection)
+    # create_all skips existing tables entirely, so backfill their indexes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except IntegrityError as e:
+                # A unique index cannot be built over existing duplicates; running
+                # without it would break the ON CONFLICT inserts that rely on it
+                columns = ", ".join(column.name for column in index.columns)
+                raise RuntimeError(
+                    f"Could not create index {index.name}: {table.name} has duplicate "
+                    f"values in ({columns}). Remove the duplicate rows and restart."
+                ) from e
@@ -0,0 +1,23 @@
+import joblib
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+# Features in the order the model was trained on (see train.py)
+N_FEATURES = 5
+
+def export_onnx(pipeline, onnx_path):
+    """Converts a fitted scikit-learn pipeline to ONNX and saves it to onnx_path."""
+    onx = convert_sklearn(
+        pipeline,
+        initial_types=[("input", FloatTensorType([None, N_FEATURES]))],
+        # Return probabilities as a plain (N, 2) tensor instead of a list of dicts
+        options={id(pipeline): {"zipmap": False}},
+    )
+    with open(onnx_path, "wb") as f:
+        f.write(onx.SerializeToString())
+
+if __name__ == "__main__":
+    # Convert the trained pickle once so the API can serve it with onnxruntime
+    pipeline = joblib.load('models/credit_model.pkl')
+    export_onnx(pipeline, 'models/credit_model.onnx')
+    print("Model exported to models/credit_model.onnx")
@@ -0,0 +1,16 @@
+# Production entrypoint: gunicorn -c gunicorn.conf.py main:app
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import main (and load the model) once in the master so forked workers share
+# its memory pages copy-on-write instead of each loading the model again
+preload_app = True
+
+def post_fork(server, worker):
+    # Connections opened by the master at import time must not be reused across
+    # processes; drop them from the pool without closing the parent's sockets
+    from db.database import engine
+    engine.dispose(close=False)
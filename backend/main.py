@@ -1,24 +1,30 @@
 # app.py
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Annotated, List, Dict, Any, Optional
 from datetime import date
+from contextlib import asynccontextmanager
+import asyncio
+import time
+import threading
 import pandas as pd
+import numpy as np
 import joblib
 import os
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case, insert
+from fastapi.concurrency import run_in_threadpool
 
-from db.database import SessionLocal, engine
+from db.database import SessionLocal, dialect_insert, create_tables
 from models import models
 from utils import geocoder
 import uvicorn
  
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Create database tables (and any indexes missing from existing ones)
+create_tables()
 
 # Dependency to get database session
 def get_db():
@@ -28,29 +34,220 @@ def get_db():
     finally:
         db.close()
 
-# load trained model (pkl) file 
+# Short-lived cache for the stats endpoints; cleared whenever borrowers are written
+STATS_TTL_SECONDS = 5
+stats_cache: Dict[str, Dict[str, Any]] = {}
+stats_cache_version = 0
+stats_cache_lock = threading.Lock()
+
+def get_cached_stats(key: str, compute):
+    entry = stats_cache.get(key)
+    now = time.monotonic()
+    if entry is not None and entry["expires"] > now:
+        return entry["value"]
+    version = stats_cache_version
+    value = compute()
+    with stats_cache_lock:
+        # A write during compute() may have made the value stale; don't cache it then
+        if version == stats_cache_version:
+            stats_cache[key] = {"value": value, "expires": now + STATS_TTL_SECONDS}
+    return value
+
+def invalidate_stats_cache():
+    global stats_cache_version
+    with stats_cache_lock:
+        stats_cache_version += 1
+        stats_cache.clear()
+
+# Country name -> region_id, filled at startup and whenever a region is created
+region_ids_by_name: Dict[str, int] = {}
+region_cache_lock = threading.Lock()
+
+def load_region_cache():
+    db = SessionLocal()
+    try:
+        rows = db.query(models.Region.region_id, models.Region.region_name).all()
+    finally:
+        db.close()
+    with region_cache_lock:
+        region_ids_by_name.update({name: region_id for region_id, name in rows})
+
+def cache_region(name: str, region_id: int):
+    with region_cache_lock:
+        region_ids_by_name[name] = region_id
+
+def get_or_create_region(db: Session, country: str, latitude=None, longitude=None):
+    """Returns (region_id, created) for a country, adding the region if it is new.
+
+    A new region is only inserted in the session's transaction; the caller
+    commits it together with the borrower and then calls cache_region.
+    """
+    region_id = region_ids_by_name.get(country)
+    if region_id is not None:
+        return region_id, False
+
+    # Cache miss: the region may have been added by another worker or the seed script
+    region_id = db.query(models.Region.region_id)\
+        .filter(models.Region.region_name == country).scalar()
+    if region_id is not None:
+        cache_region(country, region_id)
+        return region_id, False
+
+    # Get coordinates from geocoder if not provided
+    lat, lng = geocoder.get_coordinates(country)
+    # A concurrent request may insert the same country first; region_name is
+    # unique, so skip the duplicate and read back whichever row won
+    result = db.execute(
+        dialect_insert(models.Region).values(
+            region_name=country,
+            latitude=latitude if latitude else lat,
+            longitude=longitude if longitude else lng
+        ).on_conflict_do_nothing(index_elements=["region_name"])
+    )
+    region_id = db.query(models.Region.region_id)\
+        .filter(models.Region.region_name == country).scalar()
+    return region_id, result.rowcount == 1
+
+# load trained model: prefer the ONNX export, fall back to the joblib pickle
 model_path = 'models/credit_model.pkl'
-if not os.path.exists(model_path):
+onnx_model_path = 'models/credit_model.onnx'
+
+FEATURE_ORDER = ["LIMIT_BAL", "AGE", "avg_pay_delay", "credit_utilization", "payment_ratio"]
+
+model = None
+onnx_session = None
+if os.path.exists(onnx_model_path):
+    # Imported here so the pickle fallback works without onnxruntime installed
+    import onnxruntime as ort
+
+    # One session per process, pinned to a single thread: requests are already
+    # parallel across workers, so ORT's own thread pools only add overhead
+    sess_options = ort.SessionOptions()
+    sess_options.intra_op_num_threads = 1
+    sess_options.inter_op_num_threads = 1
+    sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    onnx_session = ort.InferenceSession(
+        onnx_model_path, sess_options, providers=["CPUExecutionProvider"]
+    )
+elif os.path.exists(model_path):
+    # Memory-map the model's numpy arrays so forked workers share the page cache
+    model = joblib.load(model_path, mmap_mode='r')
+else:
     raise FileNotFoundError(f"Model not found at {model_path}. Run train_credit_model.py first.")
 
-model = joblib.load(model_path)
+def predict_pd(X):
+    """Returns the probability of default for each row of a float32 feature matrix."""
+    if onnx_session is not None:
+        return onnx_session.run(["probabilities"], {"input": X})[0][:, 1]
+    # The pipeline was fitted on a DataFrame, so wrap the buffer without copying
+    return model.predict_proba(pd.DataFrame(X, columns=FEATURE_ORDER, copy=False))[:, 1]
 
-# loading borrower data from csv file kbs
-data_path = 'data/UCI_Credit_Card.csv'
-if not os.path.exists(data_path):
-	raise FileNotFoundError(
-		f"Data file not found at {data_path}"
-	)
+# Micro-batching for /credit-score: concurrent requests are queued and a single
+# background task scores them together with one predict_pd call.
+MAX_BATCH = 64
+MAX_WAIT_MS = 5
 
-# loading the complete borrower dataset into memory for fast access
-borrowers_df = pd.read_csv(data_path)
+# Risk levels by score: High < 650, Medium 650-749, Low 750+
+RISK_THRESHOLDS = np.array([650, 750])
+RISK_LABELS = np.array(["High", "Medium", "Low"])
+
+def pd_to_score_risk(probs):
+    """Converts a batch of PDs to credit scores (simple scale) and risk levels."""
+    scores = (850 - probs.astype(np.float64) * 550).astype(np.int64)
+    return scores, RISK_LABELS[np.searchsorted(RISK_THRESHOLDS, scores, side="right")]
+
+# Upper bound on how long a request waits for its batch to be scored
+SCORE_TIMEOUT_SECONDS = 10
+
+def predict_rows(X):
+    """Predicts PDs for a batch; if it fails, rows are retried one by one so a bad row only fails itself."""
+    try:
+        return list(predict_pd(X))
+    except Exception:
+        results = []
+        for i in range(len(X)):
+            try:
+                results.append(predict_pd(X[i:i + 1])[0])
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+def out_of_range_error():
+    return HTTPException(status_code=422, detail="Feature values are out of range for the model")
+
+def unavailable_error():
+    return HTTPException(status_code=503, detail="Scoring service is not running")
+
+def fail_pending(items):
+    for _, future in items:
+        if not future.done():
+            future.set_exception(unavailable_error())
+
+async def score_batches(score_queue):
+    loop = asyncio.get_running_loop()
+    # Reused input buffer; only one batch is in flight at a time
+    score_buffer = np.empty((MAX_BATCH, len(FEATURE_ORDER)), dtype=np.float32)
+    items = []
+    try:
+        while True:
+            items = [await score_queue.get()]
+            deadline = loop.time() + MAX_WAIT_MS / 1000
+            while len(items) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(score_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Rows that do not fit the float32 buffer are rejected before stacking
+            futures = []
+            for data, future in items:
+                row = score_buffer[len(futures)]
+                row[0] = data.LIMIT_BAL
+                row[1] = data.AGE
+                row[2] = data.avg_pay_delay
+                row[3] = data.credit_utilization
+                row[4] = data.payment_ratio
+                if np.isfinite(row).all():
+                    futures.append(future)
+                elif not future.done():
+                    future.set_exception(out_of_range_error())
+            if not futures:
+                continue
+
+            results = await run_in_threadpool(predict_rows, score_buffer[:len(futures)])
+            probs = np.array([np.nan if isinstance(r, Exception) else r for r in results], dtype=np.float64)
+            # Extreme inputs can still overflow inside the model and yield a NaN PD
+            finite = np.isfinite(probs)
+            scores, risks = pd_to_score_risk(np.where(finite, probs, 0))
+            for future, result, ok, score, risk in zip(futures, results, finite, scores, risks):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                elif not ok:
+                    future.set_exception(out_of_range_error())
+                else:
+                    future.set_result((float(result), int(score), str(risk)))
+    finally:
+        # Requests taken off the queue but not yet answered when the batcher stops
+        fail_pending(items)
+
+# Features are scored as float32, so larger magnitudes would overflow to inf
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+Feature = Annotated[float, Field(ge=-FLOAT32_MAX, le=FLOAT32_MAX)]
 
 class Borrower(BaseModel):
-    LIMIT_BAL: float
-    AGE: float
-    avg_pay_delay: float
-    credit_utilization: float
-    payment_ratio: float
+    # The ONNX model does not validate its input, so reject NaN/inf up front
+    model_config = ConfigDict(allow_inf_nan=False)
+
+    LIMIT_BAL: Feature
+    AGE: Feature
+    avg_pay_delay: Feature
+    credit_utilization: Feature
+    payment_ratio: Feature
 
 class BorrowerCreate(BaseModel):
     first_name: str
@@ -95,8 +292,7 @@ class BorrowerResponse(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TransactionResponse(BaseModel):
     transaction_id: int
@@ -105,8 +301,7 @@ class TransactionResponse(BaseModel):
     transaction_amount: float
     transaction_type: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DocumentResponse(BaseModel):
     document_id: int
@@ -115,10 +310,53 @@ class DocumentResponse(BaseModel):
     document_type: str
     upload_date: date
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Validates and serializes whole borrower pages in one pass
+BorrowerListAdapter = TypeAdapter(List[BorrowerResponse])
+
+class BulkCreateResponse(BaseModel):
+    created: int
+
+class RegistrationResponse(BaseModel):
+    borrower_id: int
+    message: str
+    entity_type: str
+    location: str
+
+class GlobalStatsResponse(BaseModel):
+    total_users: int
+    average_loan_amount: float
+    approved_count: int
+
+class RegionStatsResponse(BaseModel):
+    region_id: int
+    total_borrowers: int
+    high_risk_borrowers: int
+    average_loan_amount: float
+
+class CreditScoreResponse(BaseModel):
+    PD: float
+    Credit_Score: int
+    Risk_Level: str
+    Trust_Decision: str
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(load_region_cache)
+    # Created here so both are bound to the loop that serves this app
+    app.state.score_queue = asyncio.Queue()
+    app.state.batcher = asyncio.create_task(score_batches(app.state.score_queue))
+    yield
+    app.state.batcher.cancel()
+    try:
+        await app.state.batcher
+    except asyncio.CancelledError:
+        pass
+    while not app.state.score_queue.empty():
+        fail_pending([app.state.score_queue.get_nowait()])
 
-app = FastAPI(title="Credit Risk Scoring API")
+app = FastAPI(title="Credit Risk Scoring API", lifespan=lifespan)
 
 # Load environment variables
 load_dotenv()
@@ -142,50 +380,91 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.post("/api/borrowers", response_model=BorrowerResponse, status_code=201)
-def create_borrower(borrower: BorrowerCreate, db: Session = Depends(get_db)):
+def borrower_row(borrower: BorrowerCreate, region_id: Optional[int]) -> Dict[str, Any]:
+    """Maps a BorrowerCreate payload to Borrowers column values."""
     # Generate unique email if not provided
     email = borrower.email
     if not email:
         email = f"{borrower.first_name.lower()}.{borrower.last_name.lower()}@trustchain.local"
-    
+
+    return {
+        "first_name": borrower.first_name,
+        "last_name": borrower.last_name,
+        "email": email,
+        "phone": borrower.phone,
+        "loan_amount": borrower.loan_amount,
+        "loan_date": borrower.loan_date if borrower.loan_date else date.today(),
+        "decision": borrower.decision,
+        "region_id": region_id,
+        "city": borrower.city,
+        "credit_score": borrower.credit_score,
+        "risk_level": borrower.risk_level,
+        "probability_of_default": borrower.probability_of_default
+    }
+
+@app.post("/api/borrowers", response_model=BorrowerResponse, status_code=201)
+def create_borrower(borrower: BorrowerCreate, db: Session = Depends(get_db)):
     # Handle Region (Search by country name)
     region_id = borrower.region_id
+    region_created = False
     if borrower.country:
-        region = db.query(models.Region).filter(models.Region.region_name == borrower.country).first()
-        if not region:
-            lat, lng = geocoder.get_coordinates(borrower.country)
-            region = models.Region(
-                region_name=borrower.country,
-                latitude=borrower.latitude if borrower.latitude else lat,
-                longitude=borrower.longitude if borrower.longitude else lng
-            )
-            db.add(region)
-            db.commit()
-            db.refresh(region)
-        region_id = region.region_id
+        region_id, region_created = get_or_create_region(
+            db, borrower.country, borrower.latitude, borrower.longitude
+        )
 
     # Create borrower
-    db_borrower = models.Borrower(
-        first_name=borrower.first_name,
-        last_name=borrower.last_name,
-        email=email,
-        phone=borrower.phone,
-        loan_amount=borrower.loan_amount,
-        loan_date=borrower.loan_date if borrower.loan_date else date.today(),
-        decision=borrower.decision,
-        region_id=region_id,
-        city=borrower.city,
-        credit_score=borrower.credit_score,
-        risk_level=borrower.risk_level,
-        probability_of_default=borrower.probability_of_default
-    )
+    db_borrower = models.Borrower(**borrower_row(borrower, region_id))
     db.add(db_borrower)
     db.commit()
-    db.refresh(db_borrower)
+    if region_created:
+        cache_region(borrower.country, region_id)
+    invalidate_stats_cache()
     return db_borrower
 
-@app.post("/api/register-user", status_code=201)
+@app.post("/api/borrowers/bulk", response_model=BulkCreateResponse, status_code=201)
+def create_borrowers_bulk(borrowers: List[BorrowerCreate], db: Session = Depends(get_db)):
+    # Resolve every country in one query, creating the missing regions in the same transaction
+    countries = {b.country for b in borrowers if b.country}
+    region_ids = {c: region_ids_by_name[c] for c in countries if c in region_ids_by_name}
+    missing = countries - region_ids.keys()
+    if missing:
+        found = db.query(models.Region.region_id, models.Region.region_name)\
+            .filter(models.Region.region_name.in_(missing)).all()
+        region_ids.update({name: region_id for region_id, name in found})
+
+        new_regions = {}
+        for b in borrowers:
+            if b.country and b.country not in region_ids and b.country not in new_regions:
+                lat, lng = geocoder.get_coordinates(b.country)
+                new_regions[b.country] = {
+                    "region_name": b.country,
+                    "latitude": b.latitude if b.latitude else lat,
+                    "longitude": b.longitude if b.longitude else lng
+                }
+        if new_regions:
+            # Regions inserted concurrently by another request are skipped, then read back
+            db.execute(
+                dialect_insert(models.Region).on_conflict_do_nothing(index_elements=["region_name"]),
+                list(new_regions.values())
+            )
+            created = db.query(models.Region.region_id, models.Region.region_name)\
+                .filter(models.Region.region_name.in_(new_regions.keys())).all()
+            region_ids.update({name: region_id for region_id, name in created})
+
+    rows = [
+        borrower_row(b, region_ids[b.country] if b.country else b.region_id)
+        for b in borrowers
+    ]
+    if rows:
+        db.execute(insert(models.Borrower), rows)
+    db.commit()
+
+    with region_cache_lock:
+        region_ids_by_name.update(region_ids)
+    invalidate_stats_cache()
+    return {"created": len(rows)}
+
+@app.post("/api/register-user", response_model=RegistrationResponse, status_code=201)
 def register_user(user: UserRegistration, db: Session = Depends(get_db)):
     # Split name into first and last name
     name_parts = user.fullNameOrBusiness.strip().split(maxsplit=1)
@@ -193,36 +472,26 @@ def register_user(user: UserRegistration, db: Session = Depends(get_db)):
     last_name = name_parts[1] if len(name_parts) > 1 else ""
     
     # Find or create region
-    region = db.query(models.Region).filter(models.Region.region_name == user.country).first()
-    if not region:
-        # Get coordinates from geocoder if not provided
-        lat, lng = geocoder.get_coordinates(user.country)
-        
-        region = models.Region(
-            region_name=user.country,
-            latitude=user.latitude if user.latitude else lat,
-            longitude=user.longitude if user.longitude else lng
+    region_id, created = get_or_create_region(db, user.country, user.latitude, user.longitude)
+    if not created and user.latitude and user.longitude:
+        # Update coordinates if provided; committed together with the borrower
+        db.query(models.Region).filter(models.Region.region_id == region_id).update(
+            {"latitude": user.latitude, "longitude": user.longitude}
         )
-        db.add(region)
-        db.commit()
-        db.refresh(region)
-    elif user.latitude and user.longitude:
-        # Update coordinates if provided and different
-        region.latitude = user.latitude
-        region.longitude = user.longitude
-        db.commit()
     
     # Create borrower
     db_borrower = models.Borrower(
         first_name=first_name,
         last_name=last_name,
         decision="Pending",
-        region_id=region.region_id,
+        region_id=region_id,
         city=user.city
     )
     db.add(db_borrower)
     db.commit()
-    db.refresh(db_borrower)
+    if created:
+        cache_region(user.country, region_id)
+    invalidate_stats_cache()
     
     return {
         "borrower_id": db_borrower.borrower_id,
@@ -231,73 +500,89 @@ def register_user(user: UserRegistration, db: Session = Depends(get_db)):
         "location": f"{user.city}, {user.country}"
     }
 
+def query_borrower_responses(db: Session):
+    """Selects exactly the BorrowerResponse columns, joining Region in the same query."""
+    return db.query(
+        models.Borrower.borrower_id,
+        models.Borrower.first_name,
+        models.Borrower.last_name,
+        models.Borrower.email,
+        models.Borrower.phone,
+        models.Borrower.loan_amount,
+        models.Borrower.loan_date,
+        models.Borrower.decision,
+        models.Borrower.region_id,
+        models.Borrower.credit_score,
+        models.Borrower.risk_level,
+        models.Borrower.probability_of_default,
+        models.Region.region_name,
+        models.Borrower.city,
+        models.Region.latitude,
+        models.Region.longitude
+    ).outerjoin(models.Region, models.Borrower.region_id == models.Region.region_id)
+
 @app.get("/api/borrowers", response_model=List[BorrowerResponse])
 def get_all_borrowers(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records"),
     db: Session = Depends(get_db)
 ):
-    borrowers = db.query(models.Borrower).offset(skip).limit(limit).all()
-    results = []
-    for b in borrowers:
-        resp = BorrowerResponse.from_orm(b)
-        if b.region:
-            resp.region_name = b.region.region_name
-            resp.latitude = b.region.latitude
-            resp.longitude = b.region.longitude
-        results.append(resp)
-    return results
+    rows = query_borrower_responses(db).offset(skip).limit(limit).all()
+    results = BorrowerListAdapter.validate_python([row._mapping for row in rows])
+    # Returning a Response skips FastAPI's second response_model validation pass
+    return Response(content=BorrowerListAdapter.dump_json(results), media_type="application/json")
 
 @app.get("/api/borrowers/{borrower_id}", response_model=BorrowerResponse)
 def get_borrower_by_id(borrower_id: int, db: Session = Depends(get_db)):
-    db_borrower = db.query(models.Borrower).filter(models.Borrower.borrower_id == borrower_id).first()
-    if db_borrower is None:
+    row = query_borrower_responses(db).filter(models.Borrower.borrower_id == borrower_id).first()
+    if row is None:
         raise HTTPException(status_code=404, detail=f"Borrower with ID {borrower_id} not found")
     
-    resp = BorrowerResponse.from_orm(db_borrower)
-    if db_borrower.region:
-        resp.region_name = db_borrower.region.region_name
-        resp.latitude = db_borrower.region.latitude
-        resp.longitude = db_borrower.region.longitude
-    return resp
-
-@app.get("/api/stats/global")
+    return BorrowerResponse.model_validate(row._mapping)
+
+@app.get("/api/stats/global", response_model=GlobalStatsResponse)
 def get_global_stats(db: Session = Depends(get_db)):
-    total_users = db.query(func.count(models.Borrower.borrower_id)).scalar()
+    return get_cached_stats("global", lambda: compute_global_stats(db))
+
+def compute_global_stats(db: Session):
+    # One scan with conditional aggregation instead of three separate queries
+    total_users, avg_loan, approved_count = db.query(
+        func.count(models.Borrower.borrower_id),
+        func.avg(models.Borrower.loan_amount),
+        func.sum(case((models.Borrower.decision == 'Approved', 1), else_=0))
+    ).one()
     if total_users == 0:
         return {"total_users": 0, "average_loan_amount": 0, "approved_count": 0}
     
-    avg_loan = db.query(func.avg(models.Borrower.loan_amount)).scalar()
-    approved_count = db.query(func.count(models.Borrower.borrower_id))\
-        .filter(models.Borrower.decision == 'Approved').scalar()
-    
     return {
         "total_users": total_users,
         "average_loan_amount": round(float(avg_loan), 2) if avg_loan else 0,
         "approved_count": approved_count
     }
 
-@app.get("/api/stats/regions")
+@app.get("/api/stats/regions", response_model=List[RegionStatsResponse])
 def get_region_stats(db: Session = Depends(get_db)):
+    return get_cached_stats("regions", lambda: compute_region_stats(db))
+
+def compute_region_stats(db: Session):
+    # Aggregate per region in SQL, including the high-risk count, so Python only formats rows
     results = db.query(
         models.Borrower.region_id,
         func.count(models.Borrower.borrower_id).label('total_borrowers'),
-        func.avg(models.Borrower.loan_amount).label('avg_loan')
-    ).group_by(models.Borrower.region_id).all()
+        func.avg(models.Borrower.loan_amount).label('avg_loan'),
+        func.sum(case((models.Borrower.risk_level == 'High', 1), else_=0)).label('high_risk')
+    ).filter(models.Borrower.region_id.isnot(None))\
+        .group_by(models.Borrower.region_id).all()
 
-    if not results:
-        return []
-    
-    region_stats = []
-    for region_id, total, avg_loan in results:
-        if region_id is None: continue
-        region_stats.append({
+    return [
+        {
             "region_id": region_id,
             "total_borrowers": total,
+            "high_risk_borrowers": high_risk,
             "average_loan_amount": round(float(avg_loan), 2) if avg_loan else 0
-        })
-    
-    return region_stats
+        }
+        for region_id, total, avg_loan, high_risk in results
+    ]
 
 @app.get("/api/borrowers/{borrower_id}/transactions", response_model=List[TransactionResponse])
 def get_borrower_transactions(borrower_id: int, db: Session = Depends(get_db)):
@@ -310,35 +595,30 @@ def get_borrower_documents(borrower_id: int, db: Session = Depends(get_db)):
     return documents
 
 
-@app.post("/credit-score")
-def credit_score_endpoint(data: Borrower):
-    df_input = pd.DataFrame([data.dict()])
-
-    pd_prob = model.predict_proba(df_input)[:, 1][0]
-
-    # Convert PD to credit score (simple scale)
-    score = int(850 - pd_prob * 550)
-
-    # Risk level
-    if score < 650:
-        risk = "High"
-    elif score < 750:
-        risk = "Medium"
-    else:
-        risk = "Low"
+@app.post("/credit-score", response_model=CreditScoreResponse)
+async def credit_score_endpoint(data: Borrower, request: Request):
+    batcher = request.app.state.batcher
+    if batcher.done():
+        raise unavailable_error()
+    future = asyncio.get_running_loop().create_future()
+    await request.app.state.score_queue.put((data, future))
+    try:
+        pd_prob, score, risk = await asyncio.wait_for(future, SCORE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out waiting for the credit score")
 
     # Trust decision — deny if score is 450 or below
     trust_decision = "Denied" if score <= 450 else "Approved"
 
     return {
-        "PD": round(float(pd_prob), 2),
+        "PD": round(pd_prob, 2),
         "Credit_Score": score,
         "Risk_Level": risk,
         "Trust_Decision": trust_decision
     }
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Credit Risk Scoring API is running. Use /credit-score endpoint to POST data."}
 
 if __name__ == "__main__":
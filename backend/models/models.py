@@ -6,7 +6,7 @@ class Region(Base):
     __tablename__ = "Region"
 
     region_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    region_name = Column(String(100), nullable=False)
+    region_name = Column(String(100), nullable=False, unique=True, index=True)
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
 
@@ -22,8 +22,8 @@ class Borrower(Base):
     phone = Column(String(20))
     loan_amount = Column(Float)
     loan_date = Column(Date)
-    decision = Column(String(20), default="Pending") # Pending, Approved, Denied
-    region_id = Column(Integer, ForeignKey("Region.region_id", ondelete="SET NULL"))
+    decision = Column(String(20), default="Pending", index=True) # Pending, Approved, Denied
+    region_id = Column(Integer, ForeignKey("Region.region_id", ondelete="SET NULL"), index=True)
     city = Column(String(100), nullable=True)
     credit_score = Column(Integer, nullable=True)
     risk_level = Column(String(20), nullable=True)
@@ -1,90 +1,76 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from db.database import SessionLocal, engine
+from db.database import SessionLocal, dialect_insert, create_tables
 from models import models
 from utils import geocoder
+import json
+import os
 from datetime import date
+from itertools import islice
 
-# Create tables
-models.Base.metadata.create_all(bind=engine)
+DEFAULT_SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_data", "default.json")
 
-def seed_database():
+def load_seed_data(path=DEFAULT_SEED_PATH):
+    """Returns (region names, borrower rows) from a seed data JSON file.
+
+    Borrowers name their region with region_name; it is resolved to a
+    region_id when seeding.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    return data["regions"], data["borrowers"]
+
+# Rows per INSERT batch; matches the engine's insertmanyvalues_page_size
+SEED_CHUNK_SIZE = 1000
+
+def _chunked(iterable, size):
+    """Yields lists of up to size items from any iterable, without materializing it."""
+    it = iter(iterable)
+    return iter(lambda: list(islice(it, size)), [])
+
+def seed_database(region_names, borrowers):
     db = SessionLocal()
     try:
-        # Check if data already exists
-        existing_count = db.query(models.Region).count()
-        if existing_count > 0:
-            print("Database already seeded. Skipping...")
-            return
-
         # Create regions with coordinates from geocoder
-        regions_list = ["USA", "United Kingdom", "Singapore", "Rwanda", "Nigeria", "France", "Germany", "Japan", "Brazil", "India"]
-        
-        regions = []
-        for name in regions_list:
+        region_rows = []
+        for name in region_names:
             lat, lng = geocoder.get_coordinates(name)
-            region = models.Region(
-                region_name=name,
-                latitude=lat,
-                longitude=lng
-            )
-            regions.append(region)
-            db.add(region)
-        
-        db.commit()
+            region_rows.append({"region_name": name, "latitude": lat, "longitude": lng})
 
-        # Refresh to get IDs
-        for region in regions:
-            db.refresh(region)
+        # Regions that already exist are skipped by the database, so re-runs are idempotent
+        db.execute(
+            dialect_insert(models.Region).on_conflict_do_nothing(index_elements=["region_name"]),
+            region_rows
+        )
+        id_by_name = dict(
+            db.query(models.Region.region_name, models.Region.region_id)
+            .filter(models.Region.region_name.in_(region_names)).all()
+        )
 
-        # Create sample borrowers with real metrics
-        borrowers = [
-            models.Borrower(
-                first_name="John", last_name="Doe",
-                email="john.doe@trustchain.local", phone="+12125550199",
-                loan_amount=15000, loan_date=date(2024, 2, 1),
-                decision="Approved", region_id=regions[0].region_id,
-                city="New York", credit_score=780, risk_level="Low", 
-                probability_of_default=0.02
-            ),
-            models.Borrower(
-                first_name="Jane", last_name="Smith",
-                email="jane.smith@trustchain.local", phone="+442079460958",
-                loan_amount=8000, loan_date=date(2024, 1, 15),
-                decision="Approved", region_id=regions[1].region_id,
-                city="London", credit_score=720, risk_level="Low",
-                probability_of_default=0.05
-            ),
-            models.Borrower(
-                first_name="Akira", last_name="Tanaka",
-                email="akira.tanaka@trustchain.local", phone="+6561234567",
-                loan_amount=12000, loan_date=date(2024, 3, 10),
-                decision="Pending", region_id=regions[2].region_id,
-                city="Singapore", credit_score=685, risk_level="Medium",
-                probability_of_default=0.15
-            ),
-            models.Borrower(
-                first_name="Mutoni", last_name="Kamanzi",
-                email="mutoni.k@trustchain.local", phone="+250788001122",
-                loan_amount=2500, loan_date=date(2024, 1, 5),
-                decision="Approved", region_id=regions[3].region_id,
-                city="Kigali", credit_score=755, risk_level="Low",
-                probability_of_default=0.04
-            ),
-            models.Borrower(
-                first_name="Chidi", last_name="Okonkwo",
-                email="chidi.o@trustchain.local", phone="+2348012345678",
-                loan_amount=4500, loan_date=date(2023, 12, 20),
-                decision="Denied", region_id=regions[4].region_id,
-                city="Lagos", credit_score=302, risk_level="High",
-                probability_of_default=0.98
-            ),
-        ]
-        db.add_all(borrowers)
+        # Insert borrowers page by page so large loads never build one huge statement
+        inserted = 0
+        for chunk in _chunked(borrowers, SEED_CHUNK_SIZE):
+            rows = []
+            for row in chunk:
+                row = dict(row)
+                row["region_id"] = id_by_name[row.pop("region_name")]
+                if isinstance(row.get("loan_date"), str):
+                    row["loan_date"] = date.fromisoformat(row["loan_date"])
+                rows.append(row)
+            # Borrower emails are not unique in the schema, so skip borrowers already present
+            existing_emails = {
+                email for (email,) in db.query(models.Borrower.email)
+                .filter(models.Borrower.email.in_([row["email"] for row in rows]))
+            }
+            rows = [row for row in rows if row["email"] not in existing_emails]
+            if rows:
+                db.execute(insert(models.Borrower), rows)
+                inserted += len(rows)
         db.commit()
 
         print(f"✓ Global database seeded successfully!")
-        print(f"  - {len(regions)} regions created with coordinates")
-        print(f"  - {len(borrowers)} borrowers created with dynamic scores")
+        print(f"  - {len(id_by_name)} regions present with coordinates")
+        print(f"  - {inserted} borrowers created with dynamic scores")
 
     except Exception as e:
         print(f"Error seeding database: {e}")
@@ -93,4 +79,5 @@ def seed_database():
         db.close()
 
 if __name__ == "__main__":
-    seed_database()
+    create_tables()
+    seed_database(*load_seed_data())
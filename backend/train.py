@@ -8,6 +8,8 @@ from sklearn.metrics import roc_auc_score, confusion_matrix, classification_repo
 import joblib
 import os
 
+from export_onnx import export_onnx
+
 # Load data set
 df = pd.read_csv("data/UCI_Credit_Card.csv")  # adjust path if needed
 
@@ -42,7 +44,8 @@ for col in ['LIMIT_BAL', 'avg_bill', 'avg_payment']:
 
 # Prepare features
 features = ['LIMIT_BAL', 'AGE', 'avg_pay_delay', 'credit_utilization', 'payment_ratio']
-X = df[features]
+# float32 matches the FloatTensorType input of the ONNX export used for serving
+X = df[features].astype(np.float32)
 y = df['default.payment.next.month']
 
 # Split and train
@@ -71,5 +74,10 @@ print("Classification Report:\n", classification_report(y_test, y_pred_label))
 
 # Save model
 os.makedirs("models", exist_ok=True)
-joblib.dump(pipeline, 'models/credit_model.pkl')
-print("Model saved to models/credit_model.pkl")
\ No newline at end of file
+# Saved uncompressed so the API can memory-map the arrays (mmap_mode='r')
+joblib.dump(pipeline, 'models/credit_model.pkl', compress=0)
+print("Model saved to models/credit_model.pkl")
+
+# Export to ONNX for serving with onnxruntime
+export_onnx(pipeline, 'models/credit_model.onnx')
+print("Model exported to models/credit_model.onnx")
\ No newline at end of file
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 # Centroids for various countries
 COUNTRY_COORDINATES = {
     "Afghanistan": (33.9391, 67.7100),
@@ -196,6 +198,7 @@ COUNTRY_COORDINATES = {
     "Zimbabwe": (-19.0154, 29.1549),
 }
 
+@lru_cache(maxsize=4096)
 def get_coordinates(country_name: str):
     """Returns (latitude, longitude) for a country name, or a default if not found."""
     # Normalize name (strip, title case)